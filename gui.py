@@ -4,6 +4,7 @@ from pathlib import Path
 
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
 
 from utils.analyzer import Gem5Analyzer
 from utils.plotter import plotter
@@ -17,6 +18,9 @@ class Gem5PlotGUI:
         self.root.geometry("900x600")
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
+        # Select All 批量赋值期间屏蔽子项 trace 回调
+        self._suppress_trace = False
+
         # ===== Analyzer =====
         self.analyzer = Gem5Analyzer()
         self.analyzer.load_results("results/parsed")
@@ -32,10 +36,6 @@ class Gem5PlotGUI:
         # ===== UI =====
         self._build_ui()
 
-        # ===== Plot state =====
-        self.figure = None
-        self.figure_canvas = None
-
     # -------------------------------------------------
     # Close
     # -------------------------------------------------
@@ -47,13 +47,9 @@ class Gem5PlotGUI:
     # Data sync
     # -------------------------------------------------
     def _sync_data(self, rebuild_vars=False):
-        df = self.analyzer.grouped_data
-
-        self.benchmarks = sorted(df["benchmark"].unique())
-        self.configs = sorted(df["config"].unique())
-        self.metrics = [
-            c for c in df.columns if c not in ("benchmark", "config")
-        ]
+        self.benchmarks = self.analyzer.list_benchmarks()
+        self.configs = self.analyzer.list_configs()
+        self.metrics = self.analyzer.list_metrics()
         self.plot_types = plotter.supported_plot_types()
 
         if rebuild_vars:
@@ -185,6 +181,12 @@ class Gem5PlotGUI:
         self.plot_frame = ttk.Frame(right)
         self.plot_frame.pack(fill="both", expand=True)
 
+        # ===== Plot state =====
+        # Figure 与画布只创建一次，每次绘图清空后重绘
+        self.figure = Figure(dpi=100)
+        self.figure_canvas = FigureCanvasTkAgg(self.figure, master=self.plot_frame)
+        self.figure_canvas.get_tk_widget().pack(fill="both", expand=True)
+
         self.log = tk.Text(right, height=10)
         self.log.pack(fill="x")
         self._log("GUI ready.")
@@ -231,41 +233,21 @@ class Gem5PlotGUI:
         return data
 
     def _render_plot(self, plot_data):
-        self._clear_plot()
-
-        self.root.update_idletasks()
-        dpi = 100
-        w = max(self.plot_frame.winfo_width() / dpi, 6)
-        h = max(self.plot_frame.winfo_height() / dpi, 4)
-
-        self.figure = plotter.plot(
+        plotter.plot_into(
+            self.figure,
             plot_type=self.plot_type_var.get(),
             data=plot_data,
             title=self.metric_var.get(),
-            figsize=(w, h),
-        )
-
-        self.figure_canvas = FigureCanvasTkAgg(
-            self.figure, master=self.plot_frame
         )
-        self.figure_canvas.draw()
-        self.figure_canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.figure_canvas.draw_idle()
 
         self._log("Plot updated.")
 
-    def _clear_plot(self):
-        if self.figure_canvas:
-            self.figure_canvas.get_tk_widget().destroy()
-            self.figure_canvas = None
-        if self.figure:
-            plt.close(self.figure)
-            self.figure = None
-
     # -------------------------------------------------
     # Save
     # -------------------------------------------------
     def save_plot(self):
-        if not self.figure:
+        if not self.figure.axes:
             messagebox.showwarning("Warning", "No plot to save")
             return
 
@@ -288,7 +270,7 @@ class Gem5PlotGUI:
     # -------------------------------------------------
     def parse_raw_results(self):
         try:
-            success, total = parse_all_raw(
+            success, total, frames = parse_all_raw(
                 raw_dir=Path("results/raw"),
                 parsed_dir=Path("results/parsed"),
                 interest_file=Path("configs/interest.csv"),
@@ -299,7 +281,8 @@ class Gem5PlotGUI:
                 "Parse finished", f"Parsed {success}/{total} runs"
             )
 
-            self.analyzer.load_results("results/parsed")
+            # 直接使用解析得到的 DataFrame，无需再读回刚写出的 CSV
+            self.analyzer.ingest_frames(frames)
             self._sync_data(rebuild_vars=False)
             self._log(f"Reloaded parsed data ({success}/{total})")
 
@@ -311,10 +294,17 @@ class Gem5PlotGUI:
     # -------------------------------------------------
     def _toggle_all(self, vars_dict, all_var):
         value = all_var.get()
-        for v in vars_dict.values():
-            v.set(value)
+        self._suppress_trace = True
+        try:
+            for v in vars_dict.values():
+                v.set(value)
+        finally:
+            self._suppress_trace = False
+        all_var.set(value)
 
     def _update_all_state(self, vars_dict, all_var):
+        if self._suppress_trace:
+            return
         if not vars_dict:
             all_var.set(False)
             return
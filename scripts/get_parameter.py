@@ -1,6 +1,8 @@
 import re
+from collections import Counter
 from pathlib import Path
-import csv
+
+import pandas as pd
 
 def parse_value(val: str):
     if val == "nan":
@@ -34,28 +36,26 @@ class Gem5Stat:
 def extract_names_from_file(file_path: str):
     names = set()
 
-    with open(file_path, 'r') as f:
-        lines = f.readlines()
-
     in_block = False
 
-    for line in lines:
-        t = line.strip()
+    with open(file_path, 'r') as f:
+        for line in f:
+            t = line.strip()
 
-        if t == '---------- Begin Simulation Statistics ----------':
-            in_block = True
-            continue
+            if t == '---------- Begin Simulation Statistics ----------':
+                in_block = True
+                continue
 
-        if t == '---------- End Simulation Statistics ----------':
-            in_block = False
-            continue
+            if t == '---------- End Simulation Statistics ----------':
+                in_block = False
+                continue
 
-        if in_block and t:
-            try:
-                stat = Gem5Stat(line)
-                names.add(stat.name)
-            except ValueError:
-                pass
+            if in_block and t:
+                try:
+                    stat = Gem5Stat(line)
+                    names.add(stat.name)
+                except ValueError:
+                    pass
 
     return names
 
@@ -74,43 +74,51 @@ def main():
 
         # 写各自的 all_names_xxx.txt
         out_path = out_dir / f"all_names_{stem}.txt"
-        with open(out_path, "w", encoding="utf-8") as f:
-            for n in sorted(names):
-                f.write(n + "\n")
+        out_path.write_text("".join(n + "\n" for n in sorted(names)), encoding="utf-8")
 
         print(f"[OK] {stats_file.name} → {out_path.name} ({len(names)} 个参数)")
 
     # === 1. 计算所有文件共有的参数 (intersection) ===
     common_all = set.intersection(*all_sets.values())
-    with open(out_dir / "diff_common_all.txt", "w", encoding="utf-8") as f:
-        for n in sorted(common_all):
-            f.write(n + "\n")
+    (out_dir / "diff_common_all.txt").write_text(
+        "".join(n + "\n" for n in sorted(common_all)), encoding="utf-8"
+    )
 
     print(f"[INFO] 所有 stats 文件共有的参数: {len(common_all)}")
 
     # === 2. 计算每个 stats 文件独有的参数 ===
-    with open(out_dir / "diff_unique_each.txt", "w", encoding="utf-8") as f:
-        for key, name_set in all_sets.items():
-            others = set.union(*(v for k, v in all_sets.items() if k != key))
-            unique = name_set - others
-            f.write(f"=== {key} 独有参数 ({len(unique)} 个) ===\n")
-            for u in sorted(unique):
-                f.write(u + "\n")
-            f.write("\n")
+    # 统计每个参数出现在多少个文件中，出现次数为 1 即为独有
+    occurrences = Counter()
+    for name_set in all_sets.values():
+        occurrences.update(name_set)
+
+    chunks = []
+    for key, name_set in all_sets.items():
+        unique = {n for n in name_set if occurrences[n] == 1}
+        chunks.append(
+            f"=== {key} 独有参数 ({len(unique)} 个) ===\n"
+            + "".join(u + "\n" for u in sorted(unique))
+            + "\n"
+        )
+    (out_dir / "diff_unique_each.txt").write_text("".join(chunks), encoding="utf-8")
 
     print(f"[INFO] 已生成每个文件独有的参数 diff_unique_each.txt")
 
     # === 3. 生成参数 × 文件 的矩阵 CSV ===
-    all_params = sorted(set.union(*all_sets.values()))
     keys = sorted(all_sets.keys())
-
-    with open(out_dir / "diff_summary.csv", "w", newline="", encoding="utf-8") as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow(["parameter"] + keys)
-
-        for p in all_params:
-            row = [p] + [(1 if p in all_sets[k] else 0) for k in keys]
-            writer.writerow(row)
+    names_flat = [n for k in keys for n in all_sets[k]]
+    keys_flat = [k for k in keys for _ in all_sets[k]]
+
+    # 参数名 × 文件 的出现矩阵；空集合对应的文件不会出现在 crosstab 中，需要补列
+    # 行尾沿用 csv.writer 默认的 CRLF
+    matrix = (
+        pd.crosstab(pd.Series(names_flat, name="parameter"), pd.Series(keys_flat))
+        .clip(upper=1)
+        .reindex(columns=keys, fill_value=0)
+    )
+    matrix.to_csv(
+        out_dir / "diff_summary.csv", index_label="parameter", encoding="utf-8", lineterminator="\r\n"
+    )
 
     print(f"[INFO] 已生成对比矩阵 diff_summary.csv")
 
@@ -1,12 +1,23 @@
 import re
 import csv
+from bisect import bisect_right
 from pathlib import Path
 
+# 统计行的几种格式，模块加载时一次性编译
+RE_SIMPLE = re.compile(r'([\w.:\-+]+)\s+([-+]?[0-9.eE]+|nan|inf)\s+# (.*)')
+RE_PCT = re.compile(r'([\w.:\-+]+)\s+([-+]?[0-9.eE]+)\s+([-+]?[0-9.eE]+)%\s+([-+]?[0-9.eE]+)%\s*# (.*)')
+RE_UNSPECIFIED = re.compile(r'([\w.:\-+]+)\s+([-+]?[0-9.eE]+)\s+\(.*\)')
+RE_PCT_UNSPECIFIED = re.compile(
+    r'([\w.:\-+]+)\s+([-+]?[0-9.eE]+)\s+([-+]?[0-9.eE]+)%\s+([-+]?[0-9.eE]+)%\s+\(.*\)'
+)
+RE_NAME = re.compile(r'[\w.:\-+]+')
+RE_VALUE = re.compile(r'[-+]?[0-9.eE]+|nan|inf')
+
+SPECIAL_VALUES = {"nan": None, "inf": 1e99}
+
 def parse_value(val: str):
-    if val == "nan":
-        return None
-    elif val == "inf":
-        return 1e99
+    if val in SPECIAL_VALUES:
+        return SPECIAL_VALUES[val]
     elif "%" in val:
         return float(val.strip("%"))
     elif "." in val:
@@ -23,27 +34,40 @@ class Gem5Stat():
             self.name = line.split()[0]
             self.value = None
             self.description = parts[1].strip() if len(parts) > 1 else ""
-
-        elif match := re.match(r'([\w.:\-+]+)\s+([-+]?[0-9.eE]+|nan|inf)\s+# (.*)', line):
+            return
+
+        # 常见的 "name value # desc" 形式直接按空白切分，不走正则回溯
+        if line.count("#") == 1 and "%" not in line:
+            parts = line.split(None, 2)
+            if (
+                len(parts) == 3
+                and parts[2].startswith("# ")
+                and RE_NAME.fullmatch(parts[0])
+                and RE_VALUE.fullmatch(parts[1])
+            ):
+                self.name = parts[0]
+                self.value = parse_value(parts[1])
+                self.description = parts[2][2:]
+                return
+
+        if match := RE_SIMPLE.match(line):
             self.name = match.group(1)
             self.value = parse_value(match.group(2))
             self.description = match.group(3)
 
-        elif match := re.match(r'([\w.:\-+]+)\s+([-+]?[0-9.eE]+)\s+([-+]?[0-9.eE]+)%\s+([-+]?[0-9.eE]+)%\s*# (.*)', line):
+        elif match := RE_PCT.match(line):
             self.name = match.group(1)
             self.value = parse_value(match.group(2))
             self.percentage = parse_value(match.group(3))
             self.percentage_cumulative = parse_value(match.group(4))
             self.description = match.group(5)
         
-        elif match := re.match(r'([\w.:\-+]+)\s+([-+]?[0-9.eE]+)\s+\(.*\)', line):
+        elif match := RE_UNSPECIFIED.match(line):
             self.name = match.group(1)
             self.value = parse_value(match.group(2))
             self.description = "(Unspecified)"
 
-        elif match := re.match(
-            r'([\w.:\-+]+)\s+([-+]?[0-9.eE]+)\s+([-+]?[0-9.eE]+)%\s+([-+]?[0-9.eE]+)%\s+\(.*\)', line
-        ):
+        elif match := RE_PCT_UNSPECIFIED.match(line):
             self.name = match.group(1)
             self.value = parse_value(match.group(2))
             self.percentage = parse_value(match.group(3))
@@ -54,30 +78,51 @@ class Gem5Stat():
             raise ValueError(f"Cannot parse string into gem5 stat: {line}")
 
 
-def parse_gem5_stats(file_path: str) -> "list[dict[str, Gem5Stat]]":
-    with open(file_path, 'r') as f:
-        lines = f.readlines()
+def match_interest_names(interests: "list[str]", stat_names: "list[str]") -> "dict[str, list[str]]":
+    """对每个 interest 在拼接后的统计项名字符串上做一次 str.find 扫描，找出包含它的统计项"""
+    blob = "\n".join(stat_names)
+    starts = []
+    offset = 0
+    for name in stat_names:
+        starts.append(offset)
+        offset += len(name) + 1
+
+    matches = {}
+    for interest in interests:
+        hits = []
+        pos = blob.find(interest)
+        while pos != -1:
+            i = bisect_right(starts, pos) - 1
+            hits.append(stat_names[i])
+            if i + 1 >= len(starts):
+                break
+            pos = blob.find(interest, starts[i + 1])
+        matches[interest] = hits
+    return matches
 
+
+def parse_gem5_stats(file_path: str) -> "list[dict[str, Gem5Stat]]":
     stat_instances = []
     current_stat_instance = {}
 
     in_stat_instance = False
 
-    for line in lines:
-        if line.strip() == '---------- Begin Simulation Statistics ----------':
-            in_stat_instance = True
-            current_stat_instance = {}
-        elif line.strip() == '---------- End Simulation Statistics   ----------':
-            in_stat_instance = False
-            stat_instances.append(current_stat_instance)
-        elif in_stat_instance:
-            if line == "\n":
-                continue
-            try:
-                stat = Gem5Stat(line)
-                current_stat_instance[stat.name] = stat
-            except ValueError as e:
-                print(f"[INFO] Skipping unparsable stat line: {line.strip()}")
+    with open(file_path, 'r') as f:
+        for line in f:
+            if line.strip() == '---------- Begin Simulation Statistics ----------':
+                in_stat_instance = True
+                current_stat_instance = {}
+            elif line.strip() == '---------- End Simulation Statistics   ----------':
+                in_stat_instance = False
+                stat_instances.append(current_stat_instance)
+            elif in_stat_instance:
+                if line == "\n":
+                    continue
+                try:
+                    stat = Gem5Stat(line)
+                    current_stat_instance[stat.name] = stat
+                except ValueError as e:
+                    print(f"[INFO] Skipping unparsable stat line: {line.strip()}")
 
     return stat_instances
 
@@ -102,19 +147,19 @@ def main():
 
     # === Step 3: 提取数据 - 改为包含匹配 ===
     results = []
+    matched_names = match_interest_names(interest_names, list(stats))
     for interest_name in interest_names:
         matched = False
-        for stat_name, stat_obj in stats.items():
-            # 使用包含匹配而不是完全匹配
-            if interest_name in stat_name:
-                matched = True
-                value = stat_obj.value
-                # 每个匹配到的参数都单独记录，去掉description字段
-                results.append({
-                    "interest_name": interest_name,  # 原始的兴趣名称
-                    "stat_name": stat_name,         # 匹配到的统计参数名
-                    "value": value
-                })
+        # 使用包含匹配而不是完全匹配
+        for stat_name in matched_names[interest_name]:
+            matched = True
+            value = stats[stat_name].value
+            # 每个匹配到的参数都单独记录，去掉description字段
+            results.append({
+                "interest_name": interest_name,  # 原始的兴趣名称
+                "stat_name": stat_name,         # 匹配到的统计参数名
+                "value": value
+            })
         
         # 如果没有任何匹配，记录一条未匹配的信息
         if not matched:
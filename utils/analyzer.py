@@ -1,7 +1,11 @@
+import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Tuple
 import logging
+import os
 import re
 
 logger = logging.getLogger(__name__)
@@ -54,6 +58,20 @@ METRIC_RULES = {
     },
 }
 
+# 模块加载时一次性预编译所有 pattern，避免逐列重复编译
+for _rule in METRIC_RULES.values():
+    _rule["patterns"] = [re.compile(p) for p in _rule["patterns"]]
+
+ALL_PATTERNS = [p for rule in METRIC_RULES.values() for p in rule["patterns"]]
+
+# 所有 pattern 合并成一个交替正则，一次匹配即可判断某列是否被任一指标引用
+COMBINED_PATTERN = re.compile("|".join(f"(?:{p.pattern})" for p in ALL_PATTERNS))
+
+
+def _is_used_column(col: str) -> bool:
+    """read_csv 的 usecols 过滤器：只保留元信息列和被指标规则引用的列"""
+    return col in ("benchmark", "config") or COMBINED_PATTERN.match(col) is not None
+
 
 # ============================================================
 # ParamGrouper
@@ -61,14 +79,25 @@ METRIC_RULES = {
 
 class ParamGrouper:
     @staticmethod
-    def build_vectors(df: pd.DataFrame, patterns: List[str]):
+    def match_columns(columns: List[str], patterns: List[re.Pattern]) -> List[List[str]]:
+        return [[c for c in columns if pat.match(c)] for pat in patterns]
+
+    @staticmethod
+    def build_vectors(df: pd.DataFrame, patterns: List[re.Pattern]):
+        cols_per_pattern = ParamGrouper.match_columns(df.columns.tolist(), patterns)
+        return ParamGrouper.build_vectors_by_cols(df, cols_per_pattern)
+
+    @staticmethod
+    def build_vectors_by_cols(df: pd.DataFrame, cols_per_pattern: List[List[str]]):
         vectors = []
-        for pat in patterns:
-            cols = [c for c in df.columns if re.match(pat, c)]
+        for cols in cols_per_pattern:
             if not cols:
                 vectors.append(None)
             else:
-                vectors.append(df[cols].mean(axis=1))
+                # 直接在 ndarray 上对所有列/样本取均值 → scalar
+                arr = df.loc[:, cols].to_numpy(dtype=np.float64)
+                arr = arr[~np.isnan(arr)]
+                vectors.append(arr.mean() if arr.size else np.nan)
         return vectors
 
     @staticmethod
@@ -77,7 +106,9 @@ class ParamGrouper:
             return vectors[0]
 
         if op == "ratio" and len(vectors) == 2:
-            return vectors[0] / vectors[1]
+            # 分量已是 NumPy 标量，除零时与原先 Series 相除一样静默得到 inf / NaN
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return vectors[0] / vectors[1]
 
         if isinstance(op, tuple) and op[0] == "scale":
             return vectors[0] * op[1]
@@ -85,19 +116,96 @@ class ParamGrouper:
         return None
 
     @staticmethod
-    def compute_metric(df: pd.DataFrame, rule: dict) -> float:
-        vectors = ParamGrouper.build_vectors(df, rule["patterns"])
+    def compute_metric(
+        df: pd.DataFrame,
+        rule: dict,
+        cols_per_pattern: Optional[List[List[str]]] = None,
+    ) -> float:
+        if cols_per_pattern is None:
+            vectors = ParamGrouper.build_vectors(df, rule["patterns"])
+        else:
+            vectors = ParamGrouper.build_vectors_by_cols(df, cols_per_pattern)
         if any(v is None for v in vectors):
             return float("nan")
 
-        final_vec = ParamGrouper.apply_op(vectors, rule["op"])
-        if final_vec is None:
+        final_val = ParamGrouper.apply_op(vectors, rule["op"])
+        if final_val is None:
             return float("nan")
 
-        # 对时间/样本维度取均值 → scalar
-        return float(final_vec.mean())
-
-
+        return float(final_val)
+
+
+def _compute_record(
+    df: pd.DataFrame,
+    benchmark: str,
+    config: str,
+    colmap: Dict[str, List[List[str]]],
+    source,
+) -> dict:
+    record = {
+        "benchmark": benchmark,
+        "config": config,
+    }
+
+    for metric, rule in METRIC_RULES.items():
+        try:
+            record[metric] = ParamGrouper.compute_metric(df, rule, colmap[metric])
+        except Exception as e:
+            logger.error(f"Failed to compute {metric} for {source}: {e}")
+            record[metric] = float("nan")
+
+    return record
+
+
+def _run_labels(path: Path) -> Tuple[str, str]:
+    """由结果文件名得到 (benchmark, config)"""
+    benchmark = path.stem.split("_")[0]
+    config = "default"
+    return benchmark, config
+
+
+def _read_parsed_csv(csv_file: Path, columns: List[str]) -> pd.DataFrame:
+    """读取解析结果 CSV，只返回 columns 中的列
+
+    首次读取时在旁边缓存一份完整的 Feather 文件，之后只要 CSV 没有更新就直接
+    按列读取 Feather。缓存保留全部列，修改 METRIC_RULES 后无需清理缓存。
+    """
+    feather = csv_file.with_suffix(".feather")
+    if feather.exists() and feather.stat().st_mtime_ns >= csv_file.stat().st_mtime_ns:
+        return pd.read_feather(feather, columns=columns)
+
+    df = pd.read_csv(csv_file, engine="pyarrow")
+    # 缓存只是加速手段，写不进去（只读目录、磁盘已满等）时照常返回 CSV 数据
+    try:
+        df.to_feather(feather)
+    except OSError as e:
+        logger.warning(f"Failed to write feather cache {feather}: {e}")
+        feather.unlink(missing_ok=True)
+    return df[columns]
+
+
+def _read_used_columns(path: Path) -> pd.Index:
+    """只读表头/schema，返回该结果文件中被用到的列"""
+    if path.suffix == ".parquet":
+        names = pq.read_schema(path).names
+        return pd.Index([c for c in names if _is_used_column(c)])
+    return pd.read_csv(path, nrows=0, usecols=_is_used_column).columns
+
+
+def _process_one_file(
+    path: str,
+    columns: List[str],
+    colmap: Dict[str, List[List[str]]],
+) -> dict:
+    """读取单个结果文件并计算全部指标（作为进程池任务，须定义在模块顶层）"""
+    path = Path(path)
+    if path.suffix == ".parquet":
+        df = pd.read_parquet(path, columns=columns)
+    else:
+        df = _read_parsed_csv(path, columns)
+
+    benchmark, config = _run_labels(path)
+    return _compute_record(df, benchmark, config, colmap, path)
 
 
 # ============================================================
@@ -111,49 +219,96 @@ class Gem5Analyzer:
         self.grouped_data = pd.DataFrame()
         self.metric_executor = ParamGrouper()
         self.metadata = {}
+        # 列名集合 → {metric: 每个 pattern 匹配到的列}，同一批结果的 CSV 通常列名一致
+        self._colmap_cache: Dict[frozenset, Dict[str, List[List[str]]]] = {}
+        # list_* 的排序结果，仅在重新加载数据时刷新
+        self._benchmarks: List[str] = []
+        self._configs: List[str] = []
+        self._metrics: List[str] = []
     
-    def load_results(self, results_dir: str):
+    def load_results(self, results_dir: str, max_workers: Optional[int] = None):
         results_dir = Path(results_dir)
-        records = []
-
-        for csv_file in results_dir.glob("*.csv"):
-            df = pd.read_csv(csv_file)
 
-            # benchmark / config
-            benchmark = csv_file.stem.split("_")[0]
-            config = "default"
-
-            record = {
-                "benchmark": benchmark,
-                "config": config,
-            }
-
-            for metric, rule in METRIC_RULES.items():
-                try:
-                    record[metric] = self.metric_executor.compute_metric(df, rule)
-                except Exception as e:
-                    logger.error(f"Failed to compute {metric} for {csv_file}: {e}")
-                    record[metric] = float("nan")
+        # 同名结果同时存在 Parquet 与 CSV 时（旧版本留下的 CSV），以 Parquet 为准
+        parquet_files = list(results_dir.glob("*.parquet"))
+        parquet_stems = {f.stem for f in parquet_files}
+        files = parquet_files + [
+            f for f in results_dir.glob("*.csv") if f.stem not in parquet_stems
+        ]
+
+        # 只读表头即可确定需要的列及其匹配，结果随任务一起分发给子进程
+        headers = [_read_used_columns(f) for f in files]
+        columns = [h.tolist() for h in headers]
+        colmaps = [self._match_metric_columns(h) for h in headers]
+        paths = [str(f) for f in files]
+
+        workers = min(len(paths), max_workers or os.cpu_count() or 1)
+        if workers <= 1:
+            records = list(map(_process_one_file, paths, columns, colmaps))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as ex:
+                records = list(ex.map(_process_one_file, paths, columns, colmaps))
+
+        self._set_records(records)
+
+    def ingest_frames(self, frames: List[Tuple[Path, pd.DataFrame]]):
+        """直接接收解析器产出的 DataFrame，省去结果文件写出再读回的开销
+
+        frames 中的路径仅用于推导 benchmark / config，与 load_results 的规则一致。
+        """
+        records = []
+        for path, df in frames:
+            benchmark, config = _run_labels(Path(path))
+            colmap = self._match_metric_columns(df.columns)
+            records.append(_compute_record(df, benchmark, config, colmap, path))
 
-            records.append(record)
+        self._set_records(records)
 
+    def _set_records(self, records: List[dict]):
         if not records:
             return
 
-        self.grouped_data = pd.DataFrame.from_records(records)
+        # 按列收集后一次性构建 DataFrame，避免 from_records 逐行处理字典
+        cols = {"benchmark": [], "config": [], **{m: [] for m in METRIC_RULES}}
+        for record in records:
+            for key, values in cols.items():
+                values.append(record[key])
+
+        self.grouped_data = pd.DataFrame(cols)
+        # benchmark / config 取值很少，转为 category 让 isin / groupby 基于整数编码
+        self.grouped_data["benchmark"] = self.grouped_data["benchmark"].astype("category")
+        self.grouped_data["config"] = self.grouped_data["config"].astype("category")
         self._create_metadata()
 
+    def _match_metric_columns(self, columns: pd.Index) -> Dict[str, List[List[str]]]:
+        sig = frozenset(columns)
+        colmap = self._colmap_cache.get(sig)
+        if colmap is None:
+            # 先用合并正则单遍筛出候选列，逐 pattern 的匹配只在候选列上进行
+            columns = [c for c in columns if COMBINED_PATTERN.match(c)]
+            colmap = {
+                metric: self.metric_executor.match_columns(columns, rule["patterns"])
+                for metric, rule in METRIC_RULES.items()
+            }
+            self._colmap_cache[sig] = colmap
+        return colmap
+
     # --------------------------------------------------------
     # Metadata
     # --------------------------------------------------------
 
     def _create_metadata(self):
+        df = self.grouped_data
+        meta = {"benchmark", "config"}
+
+        self._benchmarks = sorted(df["benchmark"].unique().tolist())
+        self._configs = sorted(df["config"].unique().tolist())
+        self._metrics = sorted([c for c in df.columns if c not in meta])
+
         self.metadata = {
-            "num_benchmarks": self.grouped_data["benchmark"].nunique(),
-            "num_configs": self.grouped_data["config"].nunique(),
-            "num_metrics": len(
-                [c for c in self.grouped_data.columns if c not in ("benchmark", "config")]
-            ),
+            "num_benchmarks": len(self._benchmarks),
+            "num_configs": len(self._configs),
+            "num_metrics": len(self._metrics),
         }
 
     # --------------------------------------------------------
@@ -161,14 +316,13 @@ class Gem5Analyzer:
     # --------------------------------------------------------
 
     def list_benchmarks(self):
-        return sorted(self.grouped_data["benchmark"].unique().tolist())
+        return list(self._benchmarks)
 
     def list_configs(self):
-        return sorted(self.grouped_data["config"].unique().tolist())
+        return list(self._configs)
 
     def list_metrics(self):
-        meta = {"benchmark", "config"}
-        return sorted([c for c in self.grouped_data.columns if c not in meta])
+        return list(self._metrics)
 
     def select(
         self,
@@ -184,24 +338,28 @@ class Gem5Analyzer:
         if metric not in df.columns:
             raise ValueError(f"metric '{metric}' not found")
 
-        df = df[df["benchmark"].isin(benchmarks)]
-        df = df[df["config"].isin(configs)]
+        mask = df["benchmark"].isin(benchmarks) & df["config"].isin(configs)
+        df = df.loc[mask, ["benchmark", "config", metric]]
 
         if df.empty:
             return pd.DataFrame()
 
         if len(benchmarks) > 1 and len(configs) == 1:
-            return df.groupby("benchmark")[metric].agg(agg).to_frame(metric)
+            return df.groupby("benchmark", observed=True)[metric].agg(agg).to_frame(metric)
 
         if len(benchmarks) == 1 and len(configs) > 1:
-            return df.groupby("config")[metric].agg(agg).to_frame(metric)
+            return df.groupby("config", observed=True)[metric].agg(agg).to_frame(metric)
 
         if len(benchmarks) > 1 and len(configs) > 1:
+            # 每个 (benchmark, config) 只有一行时无需聚合
+            if not df.duplicated(["benchmark", "config"]).any():
+                return df.pivot(index="benchmark", columns="config", values=metric)
             return df.pivot_table(
                 index="benchmark",
                 columns="config",
                 values=metric,
                 aggfunc=agg,
+                observed=True,
             )
 
         return pd.DataFrame()
\ No newline at end of file
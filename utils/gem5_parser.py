@@ -1,9 +1,15 @@
 import re
 import csv
+import mmap
+import os
+from bisect import bisect_right
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 import pandas as pd
 
+BEGIN_MARKER = b'---------- Begin Simulation Statistics ----------'
+END_MARKER = b'---------- End Simulation Statistics   ----------'
+
 class Gem5Stat:
     """gem5统计项类"""
     def __init__(self, line: str):
@@ -42,11 +48,48 @@ class Gem5Stat:
             except:
                 return str(val)
 
+def match_interest_names(interests: List[str], stat_names: List[str]) -> Dict[str, List[str]]:
+    """对每个 interest 找出所有包含它的统计项名（保持统计项原有顺序）
+
+    将所有统计项名用换行拼成一个字符串，每个 interest 只需一次 C 层的
+    str.find 扫描，再用行起始偏移把命中位置映射回统计项名。
+    """
+    blob = "\n".join(stat_names)
+    starts = []
+    offset = 0
+    for name in stat_names:
+        starts.append(offset)
+        offset += len(name) + 1
+
+    matches = {}
+    for interest in interests:
+        hits = []
+        pos = blob.find(interest)
+        while pos != -1:
+            i = bisect_right(starts, pos) - 1
+            hits.append(stat_names[i])
+            # 同一统计项只记一次，直接跳到下一行继续查找
+            if i + 1 >= len(starts):
+                break
+            pos = blob.find(interest, starts[i + 1])
+        matches[interest] = hits
+    return matches
+
 class Gem5StatsParser:
     """gem5统计解析器"""
     
     def __init__(self, interest_file: str):
         self.interest_params = self.load_interest_params(interest_file)
+        self._interest_re = self._compile_interest()
+    
+    def _compile_interest(self) -> Optional[re.Pattern]:
+        """将所有感兴趣参数编译为一个交替正则，用于一次判断统计项名是否包含任一参数
+
+        stats.txt 以字节形式扫描，因此正则也编译为 bytes 模式。
+        """
+        if not self.interest_params:
+            return None
+        return re.compile(b"|".join(re.escape(p.encode()) for p in self.interest_params))
     
     @staticmethod
     def load_interest_params(interest_file: str) -> List[str]:
@@ -55,39 +98,46 @@ class Gem5StatsParser:
             reader = csv.DictReader(f)
             return [row["name"].strip() for row in reader if row["name"].strip()]
     
-    def parse_stats_file(self, stats_file: str) -> Dict[str, Any]:
-        """解析单个stats.txt文件"""
-        with open(stats_file, 'r') as f:
-            lines = f.readlines()
-        
+    def parse_stats_file(self, stats_file: str, only_interest: bool = False) -> Dict[str, Any]:
+        """解析单个stats.txt文件
+
+        only_interest=True 时跳过名称不包含任何感兴趣参数的统计项，不做完整解析。
+        """
+        interest_re = self._interest_re if only_interest else None
         stats = {}
-        in_stat_instance = False
-        
-        for line in lines:
-            if line.strip() == '---------- Begin Simulation Statistics ----------':
-                in_stat_instance = True
-                stats = {}
-            elif line.strip() == '---------- End Simulation Statistics   ----------':
+
+        # gem5 统计项均为 ASCII：按字节扫描 mmap，只对真正需要解析的行解码
+        with open(stats_file, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return stats
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
                 in_stat_instance = False
-                break  # 只取第一个统计块
-            elif in_stat_instance and line.strip():
-                try:
-                    stat = Gem5Stat(line)
-                    stats[stat.name] = stat.value
-                except ValueError:
-                    continue
+                for line in iter(mm.readline, b""):
+                    t = line.strip()
+                    if t == BEGIN_MARKER:
+                        in_stat_instance = True
+                        stats = {}
+                    elif t == END_MARKER:
+                        in_stat_instance = False
+                        break  # 只取第一个统计块
+                    elif in_stat_instance and t:
+                        if interest_re and not interest_re.search(t.split(None, 1)[0]):
+                            continue
+                        try:
+                            stat = Gem5Stat(t.decode())
+                            stats[stat.name] = stat.value
+                        except ValueError:
+                            continue
         
         return stats
     
     def extract_interest_stats(self, stats: Dict[str, Any]) -> Dict[str, Any]:
         """从统计中提取感兴趣的参数（包含匹配）"""
         results = {}
+        matched_names = match_interest_names(self.interest_params, list(stats))
         
         for interest in self.interest_params:
-            matches = {}
-            for stat_name, stat_value in stats.items():
-                if interest in stat_name:
-                    matches[stat_name] = stat_value
+            matches = {name: stats[name] for name in matched_names[interest]}
             
             if matches:
                 # 如果只有一个匹配，直接存储
@@ -103,7 +153,7 @@ class Gem5StatsParser:
     
     def parse_and_extract(self, stats_file: str) -> pd.DataFrame:
         """解析并提取统计数据，返回DataFrame"""
-        stats = self.parse_stats_file(stats_file)
+        stats = self.parse_stats_file(stats_file, only_interest=True)
         interest_stats = self.extract_interest_stats(stats)
         
         # 将嵌套字典展平
@@ -1,57 +1,132 @@
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
 from utils.gem5_parser import Gem5StatsParser
 
+# 一个待解析的 benchmark 运行目录
+BenchEntry = namedtuple("BenchEntry", "benchmark config stats_file")
+
 def auto_discover_benchmarks(raw_dir: Path):
     entries = []
     if not raw_dir.exists():
         return entries
 
-    for item in raw_dir.iterdir():
-        if not item.is_dir():
-            continue
+    # scandir 的 DirEntry 自带类型信息，判断目录不需要额外的 stat 调用
+    with os.scandir(raw_dir) as it:
+        for item in it:
+            if not item.is_dir():
+                continue
 
-        stats_file = item / "stats.txt"
-        if not stats_file.exists():
-            continue
+            benchmark, sep, config = item.name.partition("_")
+            if not sep:
+                continue
 
-        if "_" not in item.name:
-            continue
+            stats_file = os.path.join(item.path, "stats.txt")
+            try:
+                os.stat(stats_file)
+            except FileNotFoundError:
+                continue
 
-        benchmark, config = item.name.split("_", 1)
-        entries.append({
-            "benchmark": benchmark,
-            "config": config,
-            "stats_file": stats_file
-        })
+            entries.append(BenchEntry(benchmark, config, Path(stats_file)))
 
     return entries
 
 
+# 每个进程各自持有一个解析器，感兴趣参数只加载、编译一次
+_parser: Optional[Gem5StatsParser] = None
+
+
+def _init_worker(interest_file: str):
+    global _parser
+    _parser = Gem5StatsParser(interest_file)
+
+
+def _output_path(entry: BenchEntry, parsed_dir: Path, output_format: str) -> Path:
+    return parsed_dir / f"{entry.benchmark}_{entry.config}.{output_format}"
+
+
+def _is_up_to_date(out: Path, stats_file: Path, interest_mtime_ns: int) -> bool:
+    """输出文件比 stats.txt 和兴趣参数文件都新时无需重新解析"""
+    try:
+        out_mtime_ns = out.stat().st_mtime_ns
+    except FileNotFoundError:
+        return False
+    return out_mtime_ns >= max(stats_file.stat().st_mtime_ns, interest_mtime_ns)
+
+
+def _process_entry(entry: BenchEntry, parsed_dir: Path, output_format: str):
+    """解析单个 benchmark 并写出结果文件（作为进程池任务，须定义在模块顶层）"""
+    df = _parser.parse_and_extract(str(entry.stats_file))
+    if df.empty:
+        return None
+
+    df["benchmark"] = entry.benchmark
+    df["config"] = entry.config
+
+    out = _output_path(entry, parsed_dir, output_format)
+    if output_format == "parquet":
+        df.to_parquet(out, index=False, engine="pyarrow", compression="snappy")
+    else:
+        df.to_csv(out, index=False)
+    return out, df
+
+
 def parse_all_raw(
     raw_dir: Path,
     parsed_dir: Path,
     interest_file: Path,
-    verbose: bool = True
+    verbose: bool = True,
+    max_workers: Optional[int] = None,
+    output_format: str = "parquet",
+    force: bool = False,
 ):
-    parser = Gem5StatsParser(str(interest_file))
+    if output_format not in ("parquet", "csv"):
+        raise ValueError(f"Unsupported output format: {output_format}")
+
     entries = auto_discover_benchmarks(raw_dir)
 
     parsed_dir.mkdir(parents=True, exist_ok=True)
 
-    success = 0
-    for e in entries:
-        df = parser.parse_and_extract(str(e["stats_file"]))
-        if df.empty:
-            continue
+    # 输出已是最新的条目直接读回结果，只有其余条目需要重新解析
+    interest_mtime_ns = interest_file.stat().st_mtime_ns
+    results = [None] * len(entries)
+    stale = []
+    for i, e in enumerate(entries):
+        out = _output_path(e, parsed_dir, output_format)
+        if not force and _is_up_to_date(out, e.stats_file, interest_mtime_ns):
+            df = pd.read_parquet(out) if output_format == "parquet" else pd.read_csv(out)
+            results[i] = (out, df)
+            if verbose:
+                print(f"[UP-TO-DATE] {out}")
+        else:
+            stale.append(i)
 
-        df["benchmark"] = e["benchmark"]
-        df["config"] = e["config"]
-
-        out = parsed_dir / f'{e["benchmark"]}_{e["config"]}.csv'
-        df.to_csv(out, index=False)
-        success += 1
+    task = partial(_process_entry, parsed_dir=parsed_dir, output_format=output_format)
+    stale_entries = [entries[i] for i in stale]
+    workers = min(len(stale_entries), max_workers or os.cpu_count() or 1)
+    if not stale_entries:
+        parsed = []
+    elif workers <= 1:
+        _init_worker(str(interest_file))
+        parsed = list(map(task, stale_entries))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(str(interest_file),),
+        ) as ex:
+            parsed = list(ex.map(task, stale_entries))
 
-        if verbose:
-            print(f"[OK] {out}")
+    for i, r in zip(stale, parsed):
+        results[i] = r
+        if verbose and r is not None:
+            print(f"[OK] {r[0]}")
 
-    return success, len(entries)
+    frames = [r for r in results if r is not None]
+    return len(frames), len(entries), frames
@@ -4,20 +4,80 @@
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from typing import List, Dict, Optional, Tuple
+from bisect import bisect_right
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple, TYPE_CHECKING
 from pathlib import Path
 import logging
 
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
 logger = logging.getLogger(__name__)
 
-# 设置matplotlib样式
-plt.style.use('default')
-plt.rcParams['font.sans-serif'] = ['DejaVu Sans']
-plt.rcParams['axes.unicode_minus'] = False
-plt.rcParams['figure.dpi'] = 100
-plt.rcParams['savefig.dpi'] = 300
+# matplotlib 导入较慢，推迟到首次绘图时再加载
+@lru_cache(maxsize=None)
+def _pyplot():
+    import matplotlib.pyplot as plt
+    _configure_style(plt)
+    return plt
+
+def _configure_style(plt):
+    """设置matplotlib样式"""
+    plt.style.use('default')
+    plt.rcParams['font.sans-serif'] = ['DejaVu Sans']
+    plt.rcParams['axes.unicode_minus'] = False
+    plt.rcParams['figure.dpi'] = 100
+    plt.rcParams['savefig.dpi'] = 300
+
+SAVE_DPI = 200
+
+def _save_figure(fig: "Figure", output_file, tight: bool = True, dpi: int = SAVE_DPI):
+    """保存图表；PNG 使用最低压缩级别，写出速度远快于默认级别，文件略大"""
+    kwargs = {"dpi": dpi}
+    if tight:
+        kwargs["bbox_inches"] = "tight"
+    if str(output_file).lower().endswith(".png"):
+        kwargs["pil_kwargs"] = {"compress_level": 1, "optimize": False}
+    fig.savefig(output_file, **kwargs)
+
+def _prepare_axes(figsize, fig: Optional["Figure"] = None):
+    """fig 为 None 时新建 pyplot 图表，否则清空已有 Figure 并在其上重绘；统一使用 constrained 布局"""
+    plt = _pyplot()
+    if fig is None:
+        return plt.subplots(figsize=figsize, layout="constrained")
+    fig.clear()
+    fig.set_layout_engine("constrained")
+    return fig, fig.add_subplot()
+
+def _rotate_xticklabels(ax, rotation):
+    """旋转 x 轴刻度标签并右对齐，使标签末端对准刻度"""
+    ax.tick_params(axis="x", labelrotation=rotation)
+    for label in ax.get_xticklabels():
+        label.set_horizontalalignment("right")
+
+def _relative_luminance(rgba: np.ndarray) -> np.ndarray:
+    """按 WCAG 公式计算颜色数组的相对亮度"""
+    rgb = rgba[..., :3]
+    rgb = np.where(rgb <= 0.03928, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+    return rgb @ np.array([0.2126, 0.7152, 0.0722])
+
+# 数值格式化的量级分界及各区间的 (格式, 除数, 后缀)
+_THRESHOLDS = (1e-3, 1.0, 1e3, 1e6, 1e9)
+_FORMATS = (
+    ("%.1e", 1.0, ""),
+    ("%.3f", 1.0, ""),
+    ("%.2f", 1.0, ""),
+    ("%.1f", 1e3, "K"),
+    ("%.1f", 1e6, "M"),
+    ("%.1f", 1e9, "B"),
+)
+
+@lru_cache(maxsize=8192)
+def _format_value_cached(val: float) -> str:
+    """按量级格式化单个非零数值；统计矩阵中重复值很多，结果按值缓存"""
+    fmt, div, suffix = _FORMATS[bisect_right(_THRESHOLDS, abs(val))]
+    return fmt % (val / div) + suffix
 
 class PlotFormatter:
     """图表格式化器"""
@@ -25,36 +85,42 @@ class PlotFormatter:
     @staticmethod
     def format_value(val: float) -> str:
         """根据数值大小智能格式化数字"""
-        if pd.isna(val) or val == 0:
+        # val != val 即 NaN 判断，省去 pd.isna 的分派开销；NaN 不能作为缓存键
+        # pd.NA 参与比较会得到 NA 而无法用于 if，需先按身份排除
+        if val is None or val is pd.NA or val != val or val == 0:
             return "0"
-        
-        abs_val = abs(val)
-        if abs_val < 0.001:
-            return f"{val:.1e}"
-        elif abs_val >= 1e9:
-            return f"{val/1e9:.1f}B"
-        elif abs_val >= 1e6:
-            return f"{val/1e6:.1f}M"
-        elif abs_val >= 1000:
-            return f"{val/1000:.1f}K"
-        elif abs_val < 1:
-            return f"{val:.3f}"
-        else:
-            return f"{val:.2f}"
+
+        return _format_value_cached(float(val))
     
+    @staticmethod
+    def _format_ndarray(values: np.ndarray) -> np.ndarray:
+        """format_value 的向量化版本，按量级分桶后每桶整体格式化"""
+        arr = np.asarray(values, dtype=np.float64)
+        out = np.full(arr.shape, "0", dtype=object)
+
+        valid = ~np.isnan(arr) & (arr != 0)
+        buckets = np.digitize(np.abs(arr), _THRESHOLDS)
+        for i, (fmt, div, suffix) in enumerate(_FORMATS):
+            mask = valid & (buckets == i)
+            if mask.any():
+                out[mask] = np.char.add(np.char.mod(fmt, arr[mask] / div), suffix)
+        return out
+
+    @staticmethod
+    def format_array(values: np.ndarray) -> List[str]:
+        """批量格式化一维数值，返回标签列表"""
+        return PlotFormatter._format_ndarray(values).tolist()
+
     @staticmethod
     def create_annot_matrix(data: pd.DataFrame) -> np.ndarray:
         """创建注解矩阵"""
-        annot_matrix = np.empty_like(data.values, dtype=object)
-        for i in range(data.shape[0]):
-            for j in range(data.shape[1]):
-                annot_matrix[i, j] = PlotFormatter.format_value(data.iat[i, j])
-        return annot_matrix
+        return PlotFormatter._format_ndarray(data.to_numpy(dtype=np.float64))
     
     @staticmethod
     def set_chinese_font():
         """设置中文字体"""
         try:
+            plt = _pyplot()
             plt.rcParams['font.sans-serif'] = ['SimHei', 'DejaVu Sans']
             plt.rcParams['axes.unicode_minus'] = False
         except:
@@ -75,42 +141,44 @@ class HeatmapPlotter:
         rotate_x_labels=True,
         save: bool = False,
         output_file: Optional[str] = None,
+        fig: Optional["Figure"] = None,
+        tight: bool = True,
     ):
         if data.empty:
             logger.warning("没有数据可以绘制热力图")
             return None
 
-        plot_data = data.fillna(0)
+        # 常见情况下数据不含 NaN，直接复用原 DataFrame，避免整表拷贝
+        plot_data = data.fillna(0) if data.isna().values.any() else data
 
-        fig, ax = plt.subplots(figsize=figsize)
+        fig, ax = _prepare_axes(figsize, fig)
 
-        annot = self.formatter.create_annot_matrix(plot_data) if show_values else None
+        values = plot_data.to_numpy(dtype=np.float64)
+        mesh = ax.pcolormesh(values, cmap=cmap, edgecolors="gray", linewidth=0.5)
+        fig.colorbar(mesh, ax=ax, shrink=0.8, label="Value")
+        ax.set_xticks(np.arange(values.shape[1]) + 0.5, plot_data.columns)
+        ax.set_yticks(np.arange(values.shape[0]) + 0.5, plot_data.index)
+        ax.invert_yaxis()
 
-        sns.heatmap(
-            plot_data,
-            annot=annot,
-            fmt="",
-            cmap=cmap,
-            linewidths=0.5,
-            linecolor="gray",
-            cbar_kws={"shrink": 0.8, "label": "Value"},
-            annot_kws={"size": 9},
-            ax=ax,
-        )
+        if show_values:
+            annot = self.formatter.create_annot_matrix(plot_data)
+            # 与 seaborn 相同：深色单元格上用白字，浅色单元格上用黑字
+            dark = _relative_luminance(mesh.cmap(mesh.norm(values))) <= 0.408
+            for (i, j), text in np.ndenumerate(annot):
+                ax.text(j + 0.5, i + 0.5, text, ha="center", va="center", fontsize=9,
+                        color="w" if dark[i, j] else "k")
 
         ax.set_title(title, fontsize=14, pad=20)
         ax.set_xlabel("Metrics")
         ax.set_ylabel("Benchmarks")
 
         if rotate_x_labels:
-            ax.set_xticklabels(ax.get_xticklabels(), rotation=45, ha="right")
-
-        fig.tight_layout()
+            _rotate_xticklabels(ax, 45)
 
         if save:
             if not output_file:
                 raise ValueError("output_file required when save=True")
-            fig.savefig(output_file, dpi=300, bbox_inches="tight")
+            _save_figure(fig, output_file, tight=tight)
 
         return fig
 
@@ -127,12 +195,14 @@ class BarPlotter:
         rotation=45,
         save: bool = False,
         output_file: Optional[str] = None,
+        fig: Optional["Figure"] = None,
+        tight: bool = True,
     ):
         if data.empty:
             logger.warning("没有数据可以绘制条形图")
             return None
 
-        fig, ax = plt.subplots(figsize=figsize)
+        fig, ax = _prepare_axes(figsize, fig)
 
         if isinstance(data, pd.Series):
             data.plot(kind="bar", ax=ax, color="steelblue")
@@ -143,25 +213,19 @@ class BarPlotter:
         ax.set_ylabel("Value")
 
         if rotation:
-            ax.set_xticklabels(ax.get_xticklabels(), rotation=rotation, ha="right")
+            _rotate_xticklabels(ax, rotation)
 
         if show_values:
-            if isinstance(data, pd.Series):
-                for i, v in enumerate(data):
-                    ax.text(i, v, PlotFormatter.format_value(v), ha="center", va="bottom")
-            else:
-                for c in ax.containers:
-                    ax.bar_label(c, fmt=lambda x: PlotFormatter.format_value(x))
+            for c in ax.containers:
+                ax.bar_label(c, labels=PlotFormatter.format_array(c.datavalues))
 
         if not isinstance(data, pd.Series):
             ax.legend(bbox_to_anchor=(1.05, 1), loc="upper left")
 
-        fig.tight_layout()
-
         if save:
             if not output_file:
                 raise ValueError("output_file required when save=True")
-            fig.savefig(output_file, dpi=300, bbox_inches="tight")
+            _save_figure(fig, output_file, tight=tight)
 
         return fig
 
@@ -177,11 +241,13 @@ class LinePlotter:
         grid=True,
         save: bool = False,
         output_file: Optional[str] = None,
+        fig: Optional["Figure"] = None,
+        tight: bool = True,
     ):
         if data.empty:
             return None
 
-        fig, ax = plt.subplots(figsize=figsize)
+        fig, ax = _prepare_axes(figsize, fig)
 
         if isinstance(data, pd.Series):
             ax.plot(data.index, data.values, marker=marker, label=data.name)
@@ -196,12 +262,10 @@ class LinePlotter:
         if grid:
             ax.grid(True, linestyle="--", alpha=0.6)
 
-        fig.tight_layout()
-
         if save:
             if not output_file:
                 raise ValueError("output_file required when save=True")
-            fig.savefig(output_file, dpi=300, bbox_inches="tight")
+            _save_figure(fig, output_file, tight=tight)
 
         return fig
 
@@ -215,11 +279,13 @@ class BoxPlotter:
         rotation=45,
         save: bool = False,
         output_file: Optional[str] = None,
+        fig: Optional["Figure"] = None,
+        tight: bool = True,
     ):
         if data.empty:
             return None
 
-        fig, ax = plt.subplots(figsize=figsize)
+        fig, ax = _prepare_axes(figsize, fig)
 
         data.plot(
             kind="box",
@@ -232,14 +298,12 @@ class BoxPlotter:
         ax.set_title(title)
 
         if rotation:
-            ax.set_xticklabels(ax.get_xticklabels(), rotation=rotation, ha="right")
-
-        fig.tight_layout()
+            _rotate_xticklabels(ax, rotation)
 
         if save:
             if not output_file:
                 raise ValueError("output_file required when save=True")
-            fig.savefig(output_file, dpi=300, bbox_inches="tight")
+            _save_figure(fig, output_file, tight=tight)
 
         return fig
 
@@ -255,7 +319,9 @@ class ScatterPlotter:
                            y_label: str = "Y",
                            figsize: Tuple[int, int] = (10, 6),
                            output_file: Optional[str] = None,
-                           color_by: Optional[pd.Series] = None):
+                           color_by: Optional[pd.Series] = None,
+                           fig: Optional["Figure"] = None,
+                           tight: bool = True):
         """
         创建散点图
         
@@ -268,27 +334,37 @@ class ScatterPlotter:
             figsize: 图表大小
             output_file: 输出文件路径
             color_by: 按此序列着色
+            fig: 在已有的 Figure 上绘制（清空后重绘）
+            tight: 保存时是否裁剪空白（需要额外渲染一遍）
         """
         if len(x_data) != len(y_data):
             logger.warning("X和Y数据长度不匹配")
             return None
         
-        fig, ax = plt.subplots(figsize=figsize)
+        fig, ax = _prepare_axes(figsize, fig)
         
         # 绘制散点图
         if color_by is not None and len(color_by) == len(x_data):
             scatter = ax.scatter(x_data, y_data, c=color_by, cmap='viridis', alpha=0.7)
-            plt.colorbar(scatter, ax=ax, label='Color Value')
+            fig.colorbar(scatter, ax=ax, label='Color Value')
         else:
             ax.scatter(x_data, y_data, alpha=0.7)
         
         # 添加回归线（可选）
         if len(x_data) > 1:
             try:
-                z = np.polyfit(x_data, y_data, 1)
-                p = np.poly1d(z)
-                ax.plot(x_data, p(x_data), "r--", alpha=0.8, label=f'Regression: y={z[0]:.2f}x+{z[1]:.2f}')
-                ax.legend()
+                # 一元线性回归直接用闭式解，无需 polyfit 的 SVD 求解
+                x = np.asarray(x_data, dtype=np.float64)
+                y = np.asarray(y_data, dtype=np.float64)
+                dx = x - x.mean()
+                denom = (dx * dx).sum()
+                if denom > 0:
+                    slope = (dx * (y - y.mean())).sum() / denom
+                    intercept = y.mean() - slope * x.mean()
+                    if np.isfinite(slope) and np.isfinite(intercept):
+                        ax.plot(x, slope * x + intercept, "r--", alpha=0.8,
+                                label=f'Regression: y={slope:.2f}x+{intercept:.2f}')
+                        ax.legend()
             except:
                 pass
         
@@ -300,55 +376,44 @@ class ScatterPlotter:
         # 显示网格
         ax.grid(True, linestyle='--', alpha=0.5)
         
-        plt.tight_layout()
-        
         if output_file:
-            plt.savefig(output_file, dpi=300, bbox_inches='tight')
+            _save_figure(fig, output_file, tight=tight)
             logger.info(f"散点图已保存到: {output_file}")
         
         return fig, ax
 
 class PlotManager:
     """绘图管理器 - 统一的绘图接口"""
+
+    # 各绘图器均无状态，所有 PlotManager 实例共享同一组单例
+    heatmap = HeatmapPlotter()
+    bar = BarPlotter()
+    line = LinePlotter()
+    box = BoxPlotter()
+    scatter = ScatterPlotter()
     
-    def __init__(self):
-        self.heatmap = HeatmapPlotter()
-        self.bar = BarPlotter()
-        self.line = LinePlotter()
-        self.box = BoxPlotter()
-        self.scatter = ScatterPlotter()
-    
-    def save_all_figures(self, base_dir: str, prefix: str = ""):
-        """保存当前所有打开的图表"""
+    def save_figures(self, figures: List["Figure"], base_dir: str, prefix: str = ""):
+        """保存给定的图表，保存后立即关闭以释放画布和渲染器占用的内存"""
         base_path = Path(base_dir)
         base_path.mkdir(parents=True, exist_ok=True)
-        
-        for i, fig in enumerate(plt.get_fignums()):
-            fig_obj = plt.figure(fig)
+
+        plt = _pyplot()
+        for i, fig in enumerate(figures):
             filename = base_path / f"{prefix}figure_{i+1}.png"
-            fig_obj.savefig(filename, dpi=300, bbox_inches='tight')
+            _save_figure(fig, filename)
+            plt.close(fig)
             logger.info(f"图表已保存到: {filename}")
+
+    def save_all_figures(self, base_dir: str, prefix: str = ""):
+        """保存并关闭当前所有打开的 pyplot 图表（兼容旧接口）"""
+        plt = _pyplot()
+        figures = [plt.figure(n) for n in plt.get_fignums()]
+        self.save_figures(figures, base_dir, prefix)
     
     @staticmethod
     def close_all_figures():
         """关闭所有图表"""
-        plt.close('all')
-        
-    def __init__(self):
-        self.heatmap = HeatmapPlotter()
-        self.bar = BarPlotter()
-        self.line = LinePlotter()
-        self.box = BoxPlotter()
-        self.scatter = ScatterPlotter()
-
-        # === 给 GUI 用的注册表 ===
-        self._plot_registry = {
-            "bar": self._plot_bar,
-            "line": self._plot_line,
-            "heatmap": self._plot_heatmap,
-            "box": self._plot_box,
-            "scatter": self._plot_scatter,
-        }
+        _pyplot().close('all')
 
     # ========= GUI 接口 =========
 
@@ -367,7 +432,11 @@ class PlotManager:
         if plot_type not in self._plot_registry:
             raise ValueError(f"Unsupported plot type: {plot_type}")
 
-        return self._plot_registry[plot_type](data, **kwargs)
+        return self._plot_registry[plot_type](self, data, **kwargs)
+
+    def plot_into(self, figure: "Figure", plot_type: str, data, **kwargs):
+        """在已有的 Figure 上重绘（GUI 复用同一个画布，避免反复创建 Figure）"""
+        return self.plot(plot_type, data, fig=figure, **kwargs)
 
     # ========= 内部适配层 =========
 
@@ -387,5 +456,14 @@ class PlotManager:
         # scatter 比较特殊，一般 GUI 不会直接用
         raise NotImplementedError("Scatter needs x/y data")
 
+    # === 给 GUI 用的注册表（类级别，只构建一次）===
+    _plot_registry = {
+        "bar": _plot_bar,
+        "line": _plot_line,
+        "heatmap": _plot_heatmap,
+        "box": _plot_box,
+        "scatter": _plot_scatter,
+    }
+
 # 创建全局绘图管理器实例
 plotter = PlotManager()
\ No newline at end of file